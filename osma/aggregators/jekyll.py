@@ -2,7 +2,7 @@
 
 Fetches entries from sources and converts them into frontmatter Posts.
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 import hashlib
 from datetime import datetime
@@ -11,8 +11,10 @@ from frontmatter import Post
 from dataclasses import dataclass, asdict
 import json
 import os
+import shutil
+from loguru import logger
 
-from ..api import CoverageAggreagatorBase, CoverageEntry
+from ..api import CoverageAggreagatorBase, CoverageEntry, Query
 
 
 @dataclass
@@ -23,9 +25,27 @@ class JekyllCoverageAggregator(CoverageAggreagatorBase):
         post_location: Output path for frontmatter posts.
         last_post_dates_file_name: Path to file storing dates of last posts
             for each source.
+        backfill_windows_file_name: Path to file storing completed backfill
+            windows for each source. Defaults to
+            ``last_post_dates_file_name`` with a ``.backfill`` suffix.
+        shard_format: ``strftime`` format of the subdirectory of
+            ``post_location`` to save each post to, for e.g. ``%Y/%m``.
+            If not given, all posts are saved directly to
+            ``post_location``.
+        index_location: Output path for JSON index files. If given, every
+            new post is appended to ``days/YYYY-MM-DD.json`` and
+            ``sources/<source>/YYYY-MM.json`` indexes in this folder.
     """
     post_location: str
-    last_post_dates_file_name: str 
+    last_post_dates_file_name: str
+    backfill_windows_file_name: Optional[str] = None
+    shard_format: Optional[str] = None
+    index_location: Optional[str] = None
+
+    def __post_init__(self):
+        if self.backfill_windows_file_name is None:
+            root, ext = os.path.splitext(self.last_post_dates_file_name)
+            self.backfill_windows_file_name = f"{root}.backfill{ext}"
 
     def get_last_entry_date(self, source_name: str) -> datetime:
         """Gets date of the last entry for the source.
@@ -68,6 +88,68 @@ class JekyllCoverageAggregator(CoverageAggreagatorBase):
         with open(self.last_post_dates_file_name, 'w') as f:
             f.write(json.dumps(sources))
 
+    def read_windows(self) -> Dict[str, Dict[str, List[List[float]]]]:
+        """Reads completed backfill windows.
+
+        Returns:
+            A dictionary mapping source name and ``repr`` of the query to
+            a list of ``[start, end]`` timestamps.
+        """
+        if not os.path.exists(self.backfill_windows_file_name):
+            return {}
+
+        with open(self.backfill_windows_file_name, 'r') as f:
+            sources = json.load(f)
+        # Windows recorded without a query can't be matched to one
+        return {
+            source_name: queries
+            for source_name, queries in sources.items()
+            if isinstance(queries, dict)
+        }
+
+    def get_completed_windows(
+            self,
+            source_name: str,
+            query: Query
+            ) -> List[Tuple[datetime, datetime]]:
+        """Gets completed backfill windows for the source and query.
+
+        Args:
+            source_name: Name of the source to fetch the windows for.
+            query: Query the windows were fetched with.
+
+        Returns:
+            A list of ``(start, end)`` datetime tuples.
+        """
+        windows = self.read_windows().get(source_name, {})
+        return [
+            (datetime.fromtimestamp(start), datetime.fromtimestamp(end))
+            for start, end in windows.get(repr(query), [])
+        ]
+
+    def set_window_completed(
+            self,
+            source_name: str,
+            query: Query,
+            start: datetime,
+            end: datetime
+            ) -> None:
+        """Records a completed backfill window for the source and query.
+
+        Args:
+            source_name: Name of the source to record the window for.
+            query: Query the window was fetched with.
+            start: Start of the window.
+            end: End of the window.
+        """
+        sources = self.read_windows()
+        sources.setdefault(source_name, {}).setdefault(
+            repr(query), []
+        ).append([start.timestamp(), end.timestamp()])
+
+        with open(self.backfill_windows_file_name, 'w') as f:
+            f.write(json.dumps(sources))
+
     @staticmethod
     def entry_to_tags(entry: CoverageEntry) -> Dict[str, Any]:
         """Converts entry to dictionary of post tags.
@@ -101,10 +183,171 @@ class JekyllCoverageAggregator(CoverageAggreagatorBase):
             m.update(str(tags.get(key)).encode())
         return m.hexdigest()
 
+    def get_post_dir(self, created_at: datetime) -> str:
+        """Gets the folder to save a post to.
+
+        Args:
+            created_at: Date of the post.
+
+        Returns:
+            Path to the folder inside the post location.
+        """
+        if self.shard_format is None:
+            return self.post_location
+        return os.path.join(
+            self.post_location,
+            created_at.strftime(self.shard_format)
+        )
+
+    @staticmethod
+    def read_index(index_file_name: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """Reads items from the index file.
+
+        Recovers complete items from empty or truncated files.
+
+        Args:
+            index_file_name: Path to the index file.
+
+        Returns:
+            A list of items and whether the file is a valid index.
+        """
+        if not os.path.exists(index_file_name):
+            return [], False
+
+        with open(index_file_name, 'r') as f:
+            data = f.read()
+        try:
+            return json.loads(data), True
+        except ValueError:
+            pass
+
+        items = []
+        decoder = json.JSONDecoder()
+        pos = 1
+        while True:
+            while pos < len(data) and data[pos] in ', \n':
+                pos += 1
+            try:
+                item, pos = decoder.raw_decode(data, pos)
+            except ValueError:
+                break
+            items.append(item)
+        return items, False
+
+    @staticmethod
+    def write_index(
+            index_file_name: str, items: List[Dict[str, Any]]) -> None:
+        """Replaces the index file with the given items.
+
+        Args:
+            index_file_name: Path to the index file.
+            items: A list of JSON serialisable items.
+        """
+        os.makedirs(os.path.dirname(index_file_name), exist_ok=True)
+        tmp_file_name = f"{index_file_name}.tmp"
+        with open(tmp_file_name, 'w') as f:
+            json.dump(items, f)
+        os.replace(tmp_file_name, index_file_name)
+
+    @classmethod
+    def append_to_index(
+            cls,
+            index_file_name: str,
+            item: Dict[str, Any],
+            check_duplicates: bool = False
+            ) -> None:
+        """Appends item to a JSON list stored in the index file.
+
+        A valid file is never rewritten or read, the item is written in
+        place of the closing bracket of the list. Missing, empty or
+        truncated files are rewritten with all complete items.
+
+        Args:
+            index_file_name: Path to the index file.
+            item: A JSON serialisable item to append.
+            check_duplicates: Whether to skip the item if its ``post`` is
+                already in the index.
+        """
+        encoded = b',' + json.dumps(item).encode() + b']'
+        if not check_duplicates and os.path.exists(index_file_name):
+            with open(index_file_name, 'r+b') as f:
+                # The shortest valid index holding an item is "[{}]"
+                if f.seek(0, os.SEEK_END) > 2:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) == b']':
+                        f.seek(-1, os.SEEK_END)
+                        f.write(encoded)
+                        return
+
+        items, valid = cls.read_index(index_file_name)
+        if check_duplicates and any(
+                i.get('post') == item['post'] for i in items
+        ):
+            return
+
+        if not valid or not items:
+            cls.write_index(index_file_name, items + [item])
+        else:
+            with open(index_file_name, 'r+b') as f:
+                f.seek(-1, os.SEEK_END)
+                f.write(encoded)
+
+    def get_index_file_names(self, tags: Dict[str, Any]) -> List[str]:
+        """Gets the index files a post belongs to.
+
+        Args:
+            tags: A dictionary of post tags.
+
+        Returns:
+            Paths to the per-day and the per-source index files.
+        """
+        created_at = datetime.fromtimestamp(tags['date'])
+        return [
+            os.path.join(
+                self.index_location,
+                'days',
+                f"{created_at.strftime('%Y-%m-%d')}.json"
+            ),
+            os.path.join(
+                self.index_location,
+                'sources',
+                tags['_source_cls'],
+                f"{created_at.strftime('%Y-%m')}.json"
+            )
+        ]
+
+    def update_indexes(
+            self,
+            tags: Dict[str, Any],
+            post_path: str,
+            check_duplicates: bool = False
+            ) -> None:
+        """Appends post to the per-day and per-source indexes.
+
+        Args:
+            tags: A dictionary of post tags.
+            post_path: Path of the post relative to the post location.
+            check_duplicates: Whether to skip indexes that already hold
+                the post.
+        """
+        item = dict(tags, post=post_path)
+        for index_file_name in self.get_index_file_names(tags):
+            self.append_to_index(index_file_name, item, check_duplicates)
+
     def save_entry(self, entry: CoverageEntry) -> None:
         """Saves entry to the post location.
         
-        Converts entry to a post, and saves it to the post location.
+        Converts entry to a post, and saves it to the post location. If
+        the post is new and ``index_location`` is set, also adds it to
+        the indexes.
+
+        The post is first written to a temporary file, which is moved in
+        place after the indexes are updated. A leftover temporary file
+        means an earlier save was interrupted, so only then the indexes
+        are checked for the post before appending it.
+
+        Posts that were saved directly to the post location before
+        ``shard_format`` was set are not saved again.
 
         Args:
             entry: Input entry.
@@ -112,18 +355,103 @@ class JekyllCoverageAggregator(CoverageAggreagatorBase):
         tags = self.entry_to_tags(entry)
         entry_timestamp = tags['date']
 
-        created_at = datetime.fromtimestamp(entry_timestamp).strftime(
-            "%Y-%m-%d"
-        )
+        created_at = datetime.fromtimestamp(entry_timestamp)
         title = self.encode_tags(tags)
-        new_entry_file_name = f"{created_at}-{title}.txt"
+        new_entry_file_name = f"{created_at.strftime('%Y-%m-%d')}-{title}.txt"
 
-        new_entry_path = os.path.join(self.post_location, new_entry_file_name)
+        post_dir = self.get_post_dir(created_at)
+        new_entry_path = os.path.join(post_dir, new_entry_file_name)
 
-        if not os.path.exists(new_entry_path):
-            with open(new_entry_path, 'wb') as f:
-                post = Post(
-                    content=entry.body,
-                    osma=tags
+        if (
+                os.path.exists(new_entry_path)
+                or os.path.exists(
+                    os.path.join(self.post_location, new_entry_file_name)
                 )
-                frontmatter.dump(post, fd=f)
+        ):
+            return
+
+        os.makedirs(post_dir, exist_ok=True)
+        tmp_entry_path = f"{new_entry_path}.tmp"
+        interrupted = os.path.exists(tmp_entry_path)
+        with open(tmp_entry_path, 'wb') as f:
+            post = Post(
+                content=entry.body,
+                osma=tags
+            )
+            frontmatter.dump(post, fd=f)
+
+        if self.index_location is not None:
+            self.update_indexes(
+                tags,
+                os.path.relpath(new_entry_path, self.post_location),
+                check_duplicates=interrupted
+            )
+        os.replace(tmp_entry_path, new_entry_path)
+
+    def reshard(self) -> None:
+        """Moves existing posts to the folders given by ``shard_format``.
+
+        Posts are looked up anywhere inside the post location, so this
+        can migrate both flat folders and folders sharded using a
+        different format. The date of each post is taken from its file
+        name. Folders left empty are removed.
+
+        If ``index_location`` is set, the indexes are then rebuilt from
+        all posts, so they include posts saved before indexing was
+        enabled and point to the new post paths.
+        """
+        # The same post can be saved in folders of different layouts
+        post_paths = set()
+        for root, _, file_names in list(os.walk(self.post_location)):
+            for file_name in file_names:
+                if not file_name.endswith('.txt'):
+                    continue
+                try:
+                    created_at = datetime.strptime(file_name[:10], "%Y-%m-%d")
+                except ValueError:
+                    continue
+
+                post_dir = self.get_post_dir(created_at)
+                post_path = os.path.join(post_dir, file_name)
+                post_paths.add(post_path)
+                if os.path.abspath(root) == os.path.abspath(post_dir):
+                    continue
+
+                os.makedirs(post_dir, exist_ok=True)
+                os.replace(os.path.join(root, file_name), post_path)
+                logger.info(f'Moved {file_name} to {post_dir}')
+
+        post_location = os.path.abspath(self.post_location)
+        for root, _, _ in os.walk(self.post_location, topdown=False):
+            if os.path.abspath(root) != post_location and not os.listdir(root):
+                os.rmdir(root)
+
+        if self.index_location is not None:
+            self.rebuild_indexes(sorted(post_paths))
+
+    def rebuild_indexes(self, post_paths: List[str]) -> None:
+        """Replaces all indexes with ones built from the given posts.
+
+        Args:
+            post_paths: Paths to the posts.
+        """
+        indexes = {}
+        for post_path in post_paths:
+            tags = frontmatter.load(post_path).metadata.get('osma')
+            if tags is None:
+                continue
+            item = dict(
+                tags, post=os.path.relpath(post_path, self.post_location)
+            )
+            for index_file_name in self.get_index_file_names(tags):
+                indexes.setdefault(index_file_name, []).append(item)
+
+        for sub_dir in ['days', 'sources']:
+            shutil.rmtree(
+                os.path.join(self.index_location, sub_dir),
+                ignore_errors=True
+            )
+        for index_file_name, items in indexes.items():
+            items.sort(key=lambda i: i['date'])
+            self.write_index(index_file_name, items)
+        logger.info(f'Rebuilt {len(indexes)} indexes')
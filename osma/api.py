@@ -1,10 +1,11 @@
 """OSMA core API.
 """
 
-from typing import List, TypeVar, Optional
-from datetime import datetime
+from typing import List, Tuple, TypeVar, Optional
+from datetime import datetime, timedelta
 from dataclasses import dataclass
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from loguru import logger
 
 
@@ -109,7 +110,14 @@ class SourceBase(metaclass=SourceMeta):
 
     Source classes are responsible for fetching new entries for the given
     query and converting them to coverage entries.
+
+    Attrs:
+        MAX_WORKERS: Maximal number of time windows that can be fetched
+            concurrently from the source during a backfill. ``None``
+            means no source-specific limit.
     """
+    MAX_WORKERS: Optional[int] = None
+
     @abstractmethod
     def convert_query(self, query: Query) -> str:
         """Converts query from a standard definition to a string
@@ -130,18 +138,22 @@ class SourceBase(metaclass=SourceMeta):
     def get_query_results(
             self,
             query: str,
-            from_timestamp: Optional[datetime] = None
+            from_timestamp: Optional[datetime] = None,
+            to_timestamp: Optional[datetime] = None
             ) -> List[R]:
         """Gets intermediate query result.
 
         Args:
             query: A string representing source-specific query.
             from_timestamp: Minimal datetime of the entry to querry.
+            to_timestamp: Maximal datetime of the entry to querry.
 
         Returns:
             A list of objects, each rrepresenting an enrty in a
             source-specific format. If ``from_timestamp`` is given,
-            must only return entries that are past the timestamp.
+            must only return entries that are past the timestamp. If
+            ``to_timestamp`` is given, must only return entries that
+            are before the timestamp.
         """
         pass
 
@@ -161,17 +173,19 @@ class SourceBase(metaclass=SourceMeta):
     def fetch_entries(
             self,
             query: Query,
-            from_timestamp: datetime = None
+            from_timestamp: datetime = None,
+            to_timestamp: datetime = None
             ) -> List[CoverageEntry]:
         """Fetches entries from the source.
 
         Args:
             query: A query to use for fetching the entries.
             from_timestamp: A minimal date of entry.
+            to_timestamp: A maximal date of entry.
 
         Returns:
             A list of the coverage entries that satisfy the given
-            ``query`` and are past the given timestamp.
+            ``query`` and are within the given timestamps.
         """
         try:
             specific_query = self.convert_query(query)
@@ -180,7 +194,15 @@ class SourceBase(metaclass=SourceMeta):
                 "Could not convert input query to a specific one"
             ) from e
         try:
-            results = self.get_query_results(specific_query, from_timestamp)
+            # Sources without time windows only take ``from_timestamp``
+            kwargs = {}
+            if to_timestamp is not None:
+                kwargs['to_timestamp'] = to_timestamp
+            results = self.get_query_results(
+                specific_query,
+                from_timestamp,
+                **kwargs
+            )
         except ConnectionError as e:
             raise ConnectionError("Failed to get query results") from e
         except BaseException as e:
@@ -200,6 +222,36 @@ class SourceBase(metaclass=SourceMeta):
         )
 
 
+def split_time_range(
+        since: datetime,
+        until: datetime,
+        window: timedelta
+        ) -> List[Tuple[datetime, datetime]]:
+    """Splits time range into consecutive windows.
+
+    Args:
+        since: Start of the range.
+        until: End of the range.
+        window: Length of each window. The last window is truncated to
+            ``until``.
+
+    Returns:
+        A list of ``(start, end)`` tuples covering the range.
+
+    Raises:
+        ValueError: If ``window`` is not positive.
+    """
+    if window <= timedelta(0):
+        raise ValueError("Window length must be positive")
+    windows = []
+    start = since
+    while start < until:
+        end = min(start + window, until)
+        windows.append((start, end))
+        start = end
+    return windows
+
+
 class AggregatorMeta(ABCMeta):
     __aggs__ = {}
 
@@ -223,10 +275,14 @@ class CoverageAggreagatorBase(metaclass=AggregatorMeta):
     Attrs:
         sources: A list of sources.
         query: A query to use for fetching the entries.
+        BACKFILL_DELAY: Minimal delay between the end of a backfill and
+            the current time.
     """
     sources: List[SourceBase]
     query: str
 
+    BACKFILL_DELAY = timedelta(minutes=1)
+
     @abstractmethod
     def save_entry(self, entry: CoverageEntry) -> None:
         """Saves entry.
@@ -268,6 +324,156 @@ class CoverageAggreagatorBase(metaclass=AggregatorMeta):
         """
         pass
 
+    def get_completed_windows(
+            self,
+            source_name: str,
+            query: Query
+            ) -> List[Tuple[datetime, datetime]]:
+        """Gets backfill windows that were completed for the given source
+        and query.
+
+        Should be used in conjunction with ``set_window_completed`` to
+        allow interrupted backfills to resume only the missing windows.
+        Aggregators that support backfilling must override both methods.
+
+        Args:
+            source_name: Name of the source class to get the windows for.
+            query: Query the windows were fetched with.
+
+        Returns:
+            A list of ``(start, end)`` tuples.
+
+        Raises:
+            NotImplementedError: If the aggregator does not support
+                backfilling.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support backfilling"
+        )
+
+    def set_window_completed(
+            self,
+            source_name: str,
+            query: Query,
+            start: datetime,
+            end: datetime
+            ) -> None:
+        """Records a backfill window as completed for the given source
+        and query.
+
+        Args:
+            source_name: Name of the source class to record the window
+                for.
+            query: Query the window was fetched with.
+            start: Start of the window.
+            end: End of the window.
+
+        Raises:
+            NotImplementedError: If the aggregator does not support
+                backfilling.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support backfilling"
+        )
+
+    def backfill(
+            self,
+            since: datetime,
+            until: datetime,
+            window: timedelta = timedelta(days=1),
+            workers: int = 4
+            ) -> None:
+        """Runs aggregator over a historical time range.
+
+        For each source, splits the range into time windows and fetches
+        the windows that are not yet completed, as defined by
+        ``get_completed_windows``, concurrently. Entries are saved using
+        ``save_entry`` and each finished window is recorded using
+        ``set_window_completed``. The last entry date used by ``run`` is
+        left untouched.
+
+        Windows that failed are logged and fetched again by the next
+        backfill. If interrupted, windows that have not started yet are
+        cancelled.
+
+        Args:
+            since: Start of the range.
+            until: End of the range. Capped at ``BACKFILL_DELAY`` before
+                now, as sources may not accept more recent times.
+            window: Length of each window.
+            workers: Maximal number of windows fetched concurrently. Can
+                be further limited by ``MAX_WORKERS`` of the source.
+
+        Raises:
+            ValueError: If ``workers`` or ``window`` is not positive, or
+                ``since`` is not before ``until``.
+            NotImplementedError: If the aggregator does not support
+                backfilling.
+        """
+        if workers < 1:
+            raise ValueError("Number of workers must be positive")
+        until = min(until, datetime.now() - self.BACKFILL_DELAY)
+        if since >= until:
+            raise ValueError(f"Start of the range must be before {until}")
+        windows = split_time_range(since, until, window)
+
+        for source in self.sources:
+            source_name = source.__class__.__name__
+            completed = self.get_completed_windows(source_name, self.query)
+            missing = [
+                (start, end) for start, end in windows
+                if not any(
+                    done_start <= start and end <= done_end
+                    for done_start, done_end in completed
+                )
+            ]
+            logger.info(
+                f'Backfilling {len(missing)} of {len(windows)} windows '
+                f'from {source_name}...'
+            )
+            if not missing:
+                continue
+
+            max_workers = workers
+            if source.MAX_WORKERS is not None:
+                max_workers = min(max_workers, source.MAX_WORKERS)
+
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            try:
+                futures = {
+                    executor.submit(
+                        lambda s, e: list(source.fetch_entries(
+                            self.query,
+                            from_timestamp=s,
+                            to_timestamp=e
+                        )),
+                        start,
+                        end
+                    ): (start, end)
+                    for start, end in missing
+                }
+                for future in as_completed(futures):
+                    start, end = futures[future]
+                    try:
+                        entries = future.result()
+                    except Exception as e:
+                        logger.error(
+                            f'Failed to backfill {source_name} window '
+                            f'{start} - {end}: {e} ({e.__cause__})'
+                        )
+                        continue
+
+                    for entry in entries:
+                        logger.info(f'Fetched new entry {entry.title}')
+                        self.save_entry(entry)
+                    self.set_window_completed(
+                        source_name, self.query, start, end
+                    )
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            executor.shutdown()
+
     def run(self) -> None:
         """Runs aggregator.
 
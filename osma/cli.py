@@ -2,6 +2,7 @@
 """
 
 import sys
+from datetime import datetime, timedelta
 import click
 import toml
 from loguru import logger
@@ -67,5 +68,50 @@ def run(ctx):
         aggregator.run()
 
 
+@osma.command()
+@click.option('--since', required=True, type=click.DateTime())
+@click.option('--until', type=click.DateTime(), default=None,
+              help='End of the range, defaults to now.')
+@click.option('--window', type=click.FloatRange(min=0, min_open=True),
+              default=1.0, show_default=True, help='Window length in days.')
+@click.option('--workers', type=click.IntRange(min=1), default=4,
+              show_default=True,
+              help='Maximal number of windows fetched concurrently.')
+@click.pass_context
+def backfill(ctx, since, until, window, workers):
+    if until is None:
+        until = datetime.now()
+    if since >= until:
+        raise click.BadParameter(
+            'must be before --until', param_hint="'--since'"
+        )
+    for aggregator in ctx.obj['aggregators']:
+        logger.info(f'Backfilling {aggregator.__class__.__name__}')
+        try:
+            aggregator.backfill(
+                since,
+                until,
+                window=timedelta(days=window),
+                workers=workers
+            )
+        except ValueError as e:
+            raise click.UsageError(str(e)) from e
+        except NotImplementedError as e:
+            logger.warning(str(e))
+
+
+@osma.command()
+@click.pass_context
+def reshard(ctx):
+    for aggregator in ctx.obj['aggregators']:
+        if not hasattr(aggregator, 'reshard'):
+            logger.warning(
+                f'{aggregator.__class__.__name__} does not support resharding'
+            )
+            continue
+        logger.info(f'Resharding {aggregator.__class__.__name__}')
+        aggregator.reshard()
+
+
 if __name__ == '__main__':
     osma()
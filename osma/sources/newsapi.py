@@ -1,7 +1,7 @@
 """
 """
 import favicon
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from newsapi import NewsApiClient
 from newsapi.newsapi_exception import NewsAPIException
@@ -10,6 +10,9 @@ from ..api import SourceBase, CoverageEntry, Query, ANDQuery
 
 class NewsAPISource(SourceBase):
     PAGE_SIZE = 100
+    MAX_WORKERS = 2
+    # Windows with too many results are split down to this length
+    MIN_WINDOW = timedelta(minutes=1)
 
     def __init__(self, api_key):
         self._client = NewsApiClient(api_key=api_key)
@@ -20,21 +23,89 @@ class NewsAPISource(SourceBase):
         else:
             raise TypeError("Only supporting AND queries at the moment")
 
-    def get_query_results(self, query: str, from_timestamp: datetime = None):
-        try:
-            response = self._client.get_everything(
-                q=query,
-                from_param=from_timestamp,
-                sort_by='publishedAt',
-                page_size=self.PAGE_SIZE
+    def get_query_results(self, query: str, from_timestamp: datetime = None,
+                          to_timestamp: datetime = None):
+        # Naive datetimes are in local time, while NewsAPI reads them as UTC
+        if from_timestamp is not None:
+            from_timestamp = from_timestamp.astimezone(timezone.utc)
+        if to_timestamp is not None:
+            to_timestamp = to_timestamp.astimezone(timezone.utc)
+            return self._get_window_results(
+                query, from_timestamp, to_timestamp
             )
-        except NewsAPIException as e:
-            response = self._client.get_everything(
-                q=query,
-                sort_by='publishedAt',
-                page_size=self.PAGE_SIZE
-            )
-        return response['articles']
+
+        articles = []
+        page = 1
+        while True:
+            try:
+                response = self._client.get_everything(
+                    q=query,
+                    from_param=from_timestamp,
+                    sort_by='publishedAt',
+                    page=page,
+                    page_size=self.PAGE_SIZE
+                )
+            except NewsAPIException as e:
+                if page > 1:
+                    break
+                response = self._client.get_everything(
+                    q=query,
+                    sort_by='publishedAt',
+                    page_size=self.PAGE_SIZE
+                )
+                return response['articles']
+
+            articles.extend(response['articles'])
+            if (
+                    not response['articles']
+                    or len(articles) >= response['totalResults']
+            ):
+                break
+            page += 1
+        return articles
+
+    def _get_window_results(self, query: str, from_timestamp: datetime,
+                            to_timestamp: datetime):
+        articles = []
+        page = 1
+        while True:
+            try:
+                response = self._client.get_everything(
+                    q=query,
+                    from_param=from_timestamp,
+                    to=to_timestamp,
+                    sort_by='publishedAt',
+                    page=page,
+                    page_size=self.PAGE_SIZE
+                )
+            except NewsAPIException as e:
+                # A time window must not be replaced with the latest
+                # articles, so only retry with smaller windows
+                if e.get_exception().get('code') != 'maximumResultsReached':
+                    raise
+                if (
+                        from_timestamp is None
+                        or to_timestamp - from_timestamp <= self.MIN_WINDOW
+                ):
+                    raise RuntimeError(
+                        f"More than {len(articles)} articles between "
+                        f"{from_timestamp} and {to_timestamp} exceed the "
+                        "maximum number of results of the NewsAPI plan"
+                    ) from e
+                middle = from_timestamp + (to_timestamp - from_timestamp) / 2
+                return (
+                    self._get_window_results(query, from_timestamp, middle)
+                    + self._get_window_results(query, middle, to_timestamp)
+                )
+
+            articles.extend(response['articles'])
+            if (
+                    not response['articles']
+                    or len(articles) >= response['totalResults']
+            ):
+                break
+            page += 1
+        return articles
 
     def result_to_entry(self, result) -> CoverageEntry:
         logo = None
@@ -48,7 +119,7 @@ class NewsAPISource(SourceBase):
             date=datetime.strptime(
                 result['publishedAt'],
                 "%Y-%m-%dT%H:%M:%SZ"
-            ),
+            ).replace(tzinfo=timezone.utc),
             body=result['description'],
             title=result['title'],
             url=result['url'],
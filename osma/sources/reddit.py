@@ -5,12 +5,16 @@ from praw import Reddit
 
 
 class RedditSource(SourceBase):
+    # PRAW is not thread-safe
+    MAX_WORKERS = 1
+
     def __init__(self, client_id, client_secret, user_agent):
         self._client = Reddit(
             client_id=client_id,
             client_secret=client_secret,
             user_agent=user_agent
         )
+        self._listings = {}
 
     def convert_query(self, query: Query) -> str:
         if isinstance(query, ANDQuery):
@@ -23,11 +27,31 @@ class RedditSource(SourceBase):
         else:
             raise TypeError("Only supporting AND queries at the moment")
 
-    def get_query_results(self, query: str, from_timestamp: datetime = None):
-        listings = self._client.subreddit("all").search(query, sort='new')
-        if from_timestamp is None:
-            return listings
-        else:
+    def _iter_listing(self, query: str):
+        """Iterates over search results from the newest to the oldest.
+
+        Results are cached, so consecutive time windows of a backfill
+        walk the listing only once.
+        """
+        if query not in self._listings:
+            self._listings[query] = (
+                [],
+                iter(self._client.subreddit("all").search(
+                    query, sort='new', limit=None
+                ))
+            )
+        posts, listing = self._listings[query]
+        yield from posts
+        for post in listing:
+            posts.append(post)
+            yield post
+
+    def get_query_results(self, query: str, from_timestamp: datetime = None,
+                          to_timestamp: datetime = None):
+        if to_timestamp is None:
+            listings = self._client.subreddit("all").search(query, sort='new')
+            if from_timestamp is None:
+                return listings
             res = []
             for post in listings:
                 if post.created_utc > from_timestamp.timestamp():
@@ -36,6 +60,29 @@ class RedditSource(SourceBase):
                     break
             return res
 
+        res = []
+        count = 0
+        for post in self._iter_listing(query):
+            count += 1
+            if post.created_utc >= to_timestamp.timestamp():
+                continue
+            if (
+                    from_timestamp is None
+                    or post.created_utc >= from_timestamp.timestamp()
+            ):
+                res.append(post)
+            else:
+                return res
+
+        # Reddit cuts search listings off, often after a few hundred
+        # posts, so a window that was not reached can't be completed
+        if from_timestamp is not None and count > 0:
+            raise RuntimeError(
+                f"Search listing ended after {count} posts before reaching "
+                f"{from_timestamp}"
+            )
+        return res
+
     def result_to_entry(self, result) -> CoverageEntry:
         entry = self._create_new_entry(
             actor_primary=result.author.name,
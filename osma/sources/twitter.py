@@ -1,37 +1,76 @@
+from datetime import datetime, timedelta, timezone
 from tweepy import Client
 from ..api import SourceBase, Query, ANDQuery, CoverageEntry
 
 
 class TwitterSource(SourceBase):
+    MAX_WORKERS = 2
+    RECENT_SEARCH_PERIOD = timedelta(days=7)
+    MIN_END_TIME_DELAY = timedelta(seconds=10)
+
     def __init__(self,  access_token, access_token_secret,
-                 consumer_key, consumer_secret, bearer_token):
+                 consumer_key, consumer_secret, bearer_token,
+                 wait_on_rate_limit=True, full_archive=False):
         self._client = Client(
             access_token=access_token,
             access_token_secret=access_token_secret,
             consumer_key=consumer_key,
             consumer_secret=consumer_secret,
-            bearer_token=bearer_token
+            bearer_token=bearer_token,
+            wait_on_rate_limit=wait_on_rate_limit
         )
+        self._full_archive = full_archive
 
     def convert_query(self, query: Query) -> str:
         if isinstance(query, ANDQuery):
             return "-is:retweet " + " ".join(query.keywords)
         else:
-            raise TypeError("Only supporting AND queries at the moment") 
+            raise TypeError("Only supporting AND queries at the moment")
+
+    def get_query_results(self, query: str, from_timestamp: datetime = None,
+                          to_timestamp: datetime = None):
+        # Naive datetimes are in local time, while tweepy treats them as UTC
+        now = datetime.now(timezone.utc)
+        start_time = None
+        if from_timestamp is not None:
+            start_time = from_timestamp.astimezone(timezone.utc)
+        end_time = None
+        if to_timestamp is not None:
+            end_time = to_timestamp.astimezone(timezone.utc)
+            if end_time > now - self.MIN_END_TIME_DELAY:
+                raise ValueError(
+                    "End time must be at least "
+                    f"{self.MIN_END_TIME_DELAY.seconds} seconds in the past"
+                )
+
+        search = self._client.search_recent_tweets
+        max_results = 100
+        recent_start_time = now - self.RECENT_SEARCH_PERIOD
+        if start_time is None or start_time < recent_start_time:
+            if self._full_archive:
+                search = self._client.search_all_tweets
+                max_results = 500
+            elif end_time is not None:
+                raise ValueError(
+                    "Recent search only covers the last "
+                    f"{self.RECENT_SEARCH_PERIOD.days} days, "
+                    "set full_archive to search older tweets"
+                )
+            elif start_time is not None:
+                start_time = recent_start_time
 
-    def get_query_results(self, query: str, from_timestamp: int = None):
         posts = []
         kwargs = {
             "query": query,
+            "start_time": start_time,
+            "end_time": end_time,
+            "max_results": max_results,
             "expansions": ['author_id', 'attachments.media_keys'],
             "user_fields": ['name', 'username', 'profile_image_url'],
             "tweet_fields": ['created_at', 'context_annotations'],
             "media_fields": ['preview_image_url', 'height', 'url']
         }
-        new_posts, incs, x, info = self._client.search_recent_tweets(
-            start_time=from_timestamp,
-            **kwargs
-        )
+        new_posts, incs, _, info = search(**kwargs)
 
         while new_posts:
             if 'media' not in incs:
@@ -42,12 +81,14 @@ class TwitterSource(SourceBase):
                 in zip(new_posts, incs['users'], incs['media'])
                 ]
             )
-            new_posts, incs, _, info = self._client.search_recent_tweets(
-                since_id=info['newest_id'],
+            if 'next_token' not in info:
+                break
+            new_posts, incs, _, info = search(
+                pagination_token=info['next_token'],
                 **kwargs
             )
         return posts
-    
+
     def result_to_entry(self, result) -> CoverageEntry:
         entry = self._create_new_entry(
             actor_primary=result[1].name,
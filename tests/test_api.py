@@ -0,0 +1,188 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+import pytest
+
+from osma.api import (
+    ANDQuery, CoverageAggreagatorBase, SourceBase, split_time_range
+)
+
+
+class FakeSource(SourceBase):
+    def __init__(self, dates, failing=()):
+        self.dates = dates
+        self.failing = failing
+        self.calls = []
+
+    def convert_query(self, query):
+        return " ".join(query.keywords)
+
+    def get_query_results(self, query, from_timestamp=None,
+                          to_timestamp=None):
+        self.calls.append((from_timestamp, to_timestamp))
+        if from_timestamp in self.failing:
+            raise ConnectionError("Too many requests")
+        return [
+            date for date in self.dates
+            if from_timestamp <= date < to_timestamp
+        ]
+
+    def result_to_entry(self, result):
+        return self._create_new_entry(
+            actor_primary="actor",
+            actor_secondary="subactor",
+            date=result,
+            body="body"
+        )
+
+
+class LegacySource(FakeSource):
+    def get_query_results(self, query, from_timestamp=None):
+        return self.dates
+
+
+@dataclass
+class LegacyAggregator(CoverageAggreagatorBase):
+    saved: List[datetime] = field(default_factory=list)
+
+    def save_entry(self, entry):
+        self.saved.append(entry.date)
+
+    def get_last_entry_date(self, source_name):
+        return None
+
+    def set_last_entry_date(self, source_name, timestamp):
+        pass
+
+
+@dataclass
+class FakeAggregator(LegacyAggregator):
+    completed: List[Tuple[datetime, datetime]] = field(default_factory=list)
+
+    def set_last_entry_date(self, source_name, timestamp):
+        raise AssertionError("Backfill must not move the last entry date")
+
+    def get_completed_windows(self, source_name, query):
+        return list(self.completed)
+
+    def set_window_completed(self, source_name, query, start, end):
+        self.completed.append((start, end))
+
+
+def test_split_time_range():
+    windows = split_time_range(
+        datetime(2022, 1, 1),
+        datetime(2022, 1, 3, 12),
+        timedelta(days=1)
+    )
+    assert windows == [
+        (datetime(2022, 1, 1), datetime(2022, 1, 2)),
+        (datetime(2022, 1, 2), datetime(2022, 1, 3)),
+        (datetime(2022, 1, 3), datetime(2022, 1, 3, 12)),
+    ]
+
+
+def test_split_time_range_rejects_empty_window():
+    with pytest.raises(ValueError):
+        split_time_range(
+            datetime(2022, 1, 1), datetime(2022, 1, 2), timedelta(0)
+        )
+
+
+def test_backfill_saves_entries_on_window_boundaries():
+    dates = [
+        datetime(2022, 1, day, hour)
+        for day in range(1, 4) for hour in (0, 6, 12, 18)
+    ]
+    aggregator = FakeAggregator(
+        sources=[FakeSource(dates)], query=ANDQuery(["cats"])
+    )
+
+    aggregator.backfill(datetime(2022, 1, 1), datetime(2022, 1, 4), workers=3)
+
+    assert sorted(aggregator.saved) == dates
+    assert sorted(aggregator.completed) == split_time_range(
+        datetime(2022, 1, 1), datetime(2022, 1, 4), timedelta(days=1)
+    )
+
+
+def test_backfill_resumes_failed_windows_only():
+    source = FakeSource([], failing=(datetime(2022, 1, 2),))
+    aggregator = FakeAggregator(sources=[source], query=ANDQuery(["cats"]))
+
+    aggregator.backfill(datetime(2022, 1, 1), datetime(2022, 1, 4))
+    assert (datetime(2022, 1, 2), datetime(2022, 1, 3)) not in \
+        aggregator.completed
+
+    source.calls.clear()
+    source.failing = ()
+    aggregator.backfill(datetime(2022, 1, 1), datetime(2022, 1, 4))
+    assert source.calls == [(datetime(2022, 1, 2), datetime(2022, 1, 3))]
+
+
+def test_backfill_skips_windows_inside_completed_ones():
+    source = FakeSource([])
+    aggregator = FakeAggregator(
+        sources=[source],
+        query=ANDQuery(["cats"]),
+        completed=[(datetime(2022, 1, 1), datetime(2022, 1, 3))]
+    )
+
+    aggregator.backfill(
+        datetime(2022, 1, 1), datetime(2022, 1, 4), window=timedelta(hours=12)
+    )
+
+    assert sorted(source.calls) == [
+        (datetime(2022, 1, 3), datetime(2022, 1, 3, 12)),
+        (datetime(2022, 1, 3, 12), datetime(2022, 1, 4)),
+    ]
+
+
+def test_backfill_cancels_pending_windows_on_interrupt():
+    source = FakeSource([])
+    aggregator = FakeAggregator(sources=[source], query=ANDQuery(["cats"]))
+
+    def interrupt(source_name, query, start, end):
+        raise KeyboardInterrupt
+
+    aggregator.set_window_completed = interrupt
+    with pytest.raises(KeyboardInterrupt):
+        aggregator.backfill(
+            datetime(2022, 1, 1), datetime(2022, 2, 1), workers=1
+        )
+    assert len(source.calls) < 31
+
+
+def test_backfill_caps_range_before_now():
+    source = FakeSource([])
+    aggregator = FakeAggregator(sources=[source], query=ANDQuery(["cats"]))
+    now = datetime.now()
+
+    aggregator.backfill(now - timedelta(hours=1), now + timedelta(days=1))
+
+    assert max(end for _, end in aggregator.completed) <= \
+        now - aggregator.BACKFILL_DELAY + timedelta(seconds=1)
+
+
+@pytest.mark.parametrize("since, until, workers", [
+    (datetime(2022, 1, 2), datetime(2022, 1, 1), 1),
+    (datetime(2022, 1, 1), datetime(2022, 1, 2), 0),
+])
+def test_backfill_rejects_invalid_arguments(since, until, workers):
+    aggregator = FakeAggregator(sources=[], query=ANDQuery(["cats"]))
+    with pytest.raises(ValueError):
+        aggregator.backfill(since, until, workers=workers)
+
+
+def test_run_supports_sources_and_aggregators_without_backfill():
+    date = datetime(2022, 1, 1)
+    aggregator = LegacyAggregator(
+        sources=[LegacySource([date])], query=ANDQuery(["cats"])
+    )
+
+    aggregator.run()
+
+    assert aggregator.saved == [date]
+    with pytest.raises(NotImplementedError):
+        aggregator.backfill(datetime(2022, 1, 1), datetime(2022, 1, 2))
@@ -0,0 +1,25 @@
+import pytest
+from click.testing import CliRunner
+
+from osma import osma
+
+
+@pytest.fixture
+def config(tmp_path):
+    config_path = tmp_path / "config.toml"
+    config_path.write_text("")
+    return str(config_path)
+
+
+@pytest.mark.parametrize("args", [
+    ["--workers", "0"],
+    ["--window", "0"],
+    ["--until", "2021-12-31"],
+])
+def test_backfill_rejects_invalid_options(config, args):
+    result = CliRunner().invoke(
+        osma, ["-c", config, "backfill", "--since", "2022-01-01", *args]
+    )
+
+    assert result.exit_code == 2
+    assert "Traceback" not in result.output
@@ -0,0 +1,228 @@
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from osma.aggregators import JekyllCoverageAggregator
+from osma.api import ANDQuery, CoverageEntry, SourceBase
+
+
+class FakeSource(SourceBase):
+    def __init__(self):
+        self.calls = []
+
+    def convert_query(self, query):
+        return " ".join(query.keywords)
+
+    def get_query_results(self, query, from_timestamp=None,
+                          to_timestamp=None):
+        self.calls.append((query, from_timestamp))
+        return []
+
+    def result_to_entry(self, result):
+        pass
+
+
+def make_entry(date, actor="actor"):
+    return CoverageEntry(
+        _source_cls="FakeSource",
+        actor_primary=actor,
+        actor_secondary="subactor",
+        date=date,
+        body="body"
+    )
+
+
+@pytest.fixture
+def aggregator(tmp_path):
+    post_location = tmp_path / "_posts"
+    post_location.mkdir()
+    return JekyllCoverageAggregator(
+        sources=[],
+        query=None,
+        post_location=str(post_location),
+        last_post_dates_file_name=str(tmp_path / "last_posts.json"),
+        shard_format="%Y/%m",
+        index_location=str(tmp_path / "_data")
+    )
+
+
+def list_posts(aggregator):
+    return sorted(
+        os.path.relpath(
+            os.path.join(root, file_name), aggregator.post_location
+        )
+        for root, _, file_names in os.walk(aggregator.post_location)
+        for file_name in file_names
+    )
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_completed_windows_round_trip(aggregator):
+    query = ANDQuery(["cats"])
+    aggregator.set_window_completed(
+        "FakeSource", query, datetime(2022, 1, 1), datetime(2022, 1, 2)
+    )
+
+    assert aggregator.backfill_windows_file_name.endswith(
+        "last_posts.backfill.json"
+    )
+    assert aggregator.get_completed_windows("FakeSource", query) == [
+        (datetime(2022, 1, 1), datetime(2022, 1, 2))
+    ]
+    assert aggregator.get_completed_windows("OtherSource", query) == []
+    assert aggregator.get_completed_windows(
+        "FakeSource", ANDQuery(["dogs"])
+    ) == []
+
+
+def test_backfill_fetches_windows_again_for_new_query(aggregator):
+    source = FakeSource()
+    aggregator.sources = [source]
+    aggregator.query = ANDQuery(["cats"])
+    aggregator.backfill(datetime(2022, 1, 1), datetime(2022, 1, 3))
+
+    aggregator.query = ANDQuery(["cute", "cats"])
+    aggregator.backfill(datetime(2022, 1, 1), datetime(2022, 1, 3))
+    aggregator.backfill(datetime(2022, 1, 1), datetime(2022, 1, 3))
+
+    assert [query for query, _ in source.calls] == \
+        ["cats"] * 2 + ["cute cats"] * 2
+
+
+@pytest.mark.parametrize("content, items", [
+    ("", []),
+    ("[", []),
+    ('[{"post": "a"},{"po', [{"post": "a"}]),
+])
+def test_append_to_index_recovers_broken_file(tmp_path, content, items):
+    index_file_name = tmp_path / "index.json"
+    index_file_name.write_text(content)
+
+    JekyllCoverageAggregator.append_to_index(
+        str(index_file_name), {"post": "b"}
+    )
+
+    assert read_json(index_file_name) == items + [{"post": "b"}]
+
+
+def test_append_to_index_skips_indexed_posts(tmp_path):
+    index_file_name = str(tmp_path / "index.json")
+
+    for post in ["a", "b", "a"]:
+        JekyllCoverageAggregator.append_to_index(
+            index_file_name, {"post": post}, check_duplicates=True
+        )
+
+    assert read_json(index_file_name) == [{"post": "a"}, {"post": "b"}]
+
+
+def test_append_to_index_does_not_read_valid_file(tmp_path, monkeypatch):
+    index_file_name = str(tmp_path / "index.json")
+    JekyllCoverageAggregator.append_to_index(index_file_name, {"post": "a"})
+
+    def read_index(index_file_name):
+        raise AssertionError("Valid index must not be read")
+
+    monkeypatch.setattr(JekyllCoverageAggregator, "read_index", read_index)
+    JekyllCoverageAggregator.append_to_index(index_file_name, {"post": "b"})
+    monkeypatch.undo()
+
+    assert read_json(index_file_name) == [{"post": "a"}, {"post": "b"}]
+
+
+def test_save_entry_shards_posts_and_indexes_paths(aggregator):
+    entry = make_entry(datetime(2022, 1, 5, 12))
+
+    aggregator.save_entry(entry)
+    aggregator.save_entry(entry)
+
+    posts = list_posts(aggregator)
+    assert len(posts) == 1
+    assert posts[0].startswith(os.path.join("2022", "01", "2022-01-05-"))
+    day_index = read_json(
+        os.path.join(aggregator.index_location, "days", "2022-01-05.json")
+    )
+    source_index = read_json(os.path.join(
+        aggregator.index_location, "sources", "FakeSource", "2022-01.json"
+    ))
+    assert [i["post"] for i in day_index] == posts
+    assert source_index == day_index
+
+
+def test_interrupted_save_entry_is_indexed_once(aggregator):
+    entry = make_entry(datetime(2022, 1, 5, 12))
+    aggregator.save_entry(entry)
+    post_path = os.path.join(
+        aggregator.post_location, list_posts(aggregator)[0]
+    )
+    os.replace(post_path, f"{post_path}.tmp")
+
+    aggregator.save_entry(entry)
+
+    assert os.path.exists(post_path)
+    assert not os.path.exists(f"{post_path}.tmp")
+    assert len(read_json(
+        os.path.join(aggregator.index_location, "days", "2022-01-05.json")
+    )) == 1
+
+
+def test_save_entry_skips_unmigrated_flat_posts(aggregator):
+    entry = make_entry(datetime(2022, 1, 5, 12))
+    index_location = aggregator.index_location
+    aggregator.shard_format = None
+    aggregator.index_location = None
+    aggregator.save_entry(entry)
+
+    aggregator.shard_format = "%Y/%m"
+    aggregator.index_location = index_location
+    aggregator.save_entry(entry)
+
+    assert len(list_posts(aggregator)) == 1
+    assert not os.path.exists(index_location)
+
+
+def test_reshard_moves_posts_and_rebuilds_indexes(aggregator):
+    index_location = aggregator.index_location
+    aggregator.shard_format = None
+    aggregator.index_location = None
+    for day in [5, 6]:
+        aggregator.save_entry(make_entry(datetime(2022, 1, day)))
+    aggregator.shard_format = "%Y/%m/%d"
+    aggregator.reshard()
+
+    aggregator.shard_format = "%Y/%m"
+    aggregator.index_location = index_location
+    aggregator.reshard()
+
+    posts = list_posts(aggregator)
+    assert [os.path.dirname(p) for p in posts] == \
+        [os.path.join("2022", "01")] * 2
+    assert sorted(os.listdir(os.path.join(aggregator.post_location, "2022",
+                                          "01"))) == \
+        [os.path.basename(p) for p in posts]
+    source_index = read_json(os.path.join(
+        index_location, "sources", "FakeSource", "2022-01.json"
+    ))
+    assert [i["post"] for i in source_index] == posts
+
+
+def test_reshard_indexes_duplicated_posts_once(aggregator):
+    entry = make_entry(datetime(2022, 1, 5))
+    aggregator.save_entry(entry)
+    aggregator.shard_format = "%Y"
+    aggregator.save_entry(entry)
+    assert len(list_posts(aggregator)) == 2
+
+    aggregator.reshard()
+
+    posts = list_posts(aggregator)
+    assert len(posts) == 1
+    assert [i["post"] for i in read_json(
+        os.path.join(aggregator.index_location, "days", "2022-01-05.json")
+    )] == posts
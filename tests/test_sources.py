@@ -0,0 +1,218 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from newsapi.newsapi_exception import NewsAPIException
+
+from osma.sources import RedditSource, TwitterSource, NewsAPISource
+
+
+class FakeSubreddit:
+    def __init__(self, posts):
+        self.posts = posts
+        self.searches = 0
+
+    def search(self, query, sort, limit=100):
+        self.searches += 1
+        return iter(self.posts[:limit])
+
+
+def make_reddit_source(posts):
+    source = RedditSource.__new__(RedditSource)
+    subreddit = FakeSubreddit(posts)
+    source._client = SimpleNamespace(subreddit=lambda name: subreddit)
+    source._listings = {}
+    return source, subreddit
+
+
+def test_reddit_windows_include_start_boundary():
+    dates = [datetime(2022, 1, 3), datetime(2022, 1, 2, 12),
+             datetime(2022, 1, 2), datetime(2022, 1, 1),
+             datetime(2021, 12, 31)]
+    posts = [SimpleNamespace(created_utc=d.timestamp()) for d in dates]
+    source, subreddit = make_reddit_source(posts)
+
+    first = source.get_query_results(
+        "cats", datetime(2022, 1, 2), datetime(2022, 1, 3)
+    )
+    second = source.get_query_results(
+        "cats", datetime(2022, 1, 1), datetime(2022, 1, 2)
+    )
+
+    assert first == posts[1:3]
+    assert second == posts[3:4]
+    assert subreddit.searches == 1
+
+
+def test_reddit_window_past_listing_end_fails():
+    posts = [
+        SimpleNamespace(created_utc=datetime(2022, 1, 2).timestamp())
+        for _ in range(250)
+    ]
+    source, _ = make_reddit_source(posts)
+
+    with pytest.raises(RuntimeError):
+        source.get_query_results(
+            "cats", datetime(2022, 1, 1), datetime(2022, 1, 2)
+        )
+
+
+def test_reddit_window_with_empty_listing_is_empty():
+    source, _ = make_reddit_source([])
+
+    assert source.get_query_results(
+        "cats", datetime(2022, 1, 1), datetime(2022, 1, 2)
+    ) == []
+
+
+class FakeNewsAPI:
+    def __init__(self, total, fail_dates=False, max_results=None):
+        self.total = total
+        self.fail_dates = fail_dates
+        self.max_results = max_results
+        self.calls = []
+
+    def get_everything(self, q, sort_by, page_size, page=None,
+                       from_param=None, to=None):
+        if self.fail_dates and from_param is not None:
+            raise NewsAPIException({"code": "parameterInvalid"})
+        self.calls.append((from_param, to, page))
+        total = self.total
+        if from_param is not None and to is not None:
+            total = int(self.total * (to - from_param) / timedelta(days=1))
+        start = ((page or 1) - 1) * page_size
+        if self.max_results is not None and start >= self.max_results:
+            raise NewsAPIException({"code": "maximumResultsReached"})
+        count = max(min(page_size, total - start), 0)
+        return {
+            "totalResults": total,
+            "articles": [{"n": start + i} for i in range(count)]
+        }
+
+
+def make_newsapi_source(client):
+    source = NewsAPISource.__new__(NewsAPISource)
+    source._client = client
+    return source
+
+
+def test_newsapi_fetches_all_pages():
+    source = make_newsapi_source(FakeNewsAPI(total=250))
+
+    articles = source.get_query_results(
+        "cats", datetime(2022, 1, 1), datetime(2022, 1, 2)
+    )
+
+    assert len(articles) == 250
+    assert [page for _, _, page in source._client.calls] == [1, 2, 3]
+
+
+def test_newsapi_window_does_not_fall_back_to_latest_articles():
+    source = make_newsapi_source(FakeNewsAPI(total=10, fail_dates=True))
+
+    with pytest.raises(NewsAPIException):
+        source.get_query_results(
+            "cats", datetime(2022, 1, 1), datetime(2022, 1, 2)
+        )
+
+
+def test_newsapi_sends_window_in_utc():
+    source = make_newsapi_source(FakeNewsAPI(total=0))
+    start = datetime(2022, 1, 1)
+
+    source.get_query_results("cats", start, start + timedelta(days=1))
+
+    from_param, to, _ = source._client.calls[0]
+    assert from_param.utcoffset() == timedelta(0)
+    assert from_param == start.astimezone(timezone.utc)
+    assert to - from_param == timedelta(days=1)
+
+
+def test_newsapi_splits_window_over_result_limit():
+    source = make_newsapi_source(FakeNewsAPI(total=300, max_results=100))
+
+    articles = source.get_query_results(
+        "cats", datetime(2022, 1, 1), datetime(2022, 1, 2)
+    )
+
+    assert len(articles) == 300
+    assert max(to - from_param for from_param, to, _ in
+               source._client.calls) == timedelta(days=1)
+    assert min(to - from_param for from_param, to, _ in
+               source._client.calls) == timedelta(hours=6)
+
+
+def test_newsapi_window_over_result_limit_fails_at_min_window():
+    source = make_newsapi_source(
+        FakeNewsAPI(total=10 ** 6, max_results=100)
+    )
+
+    with pytest.raises(RuntimeError, match="maximum number of results"):
+        source.get_query_results(
+            "cats", datetime(2022, 1, 1), datetime(2022, 1, 1, 0, 10)
+        )
+
+
+class FakeTwitterClient:
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def search(self, **kwargs):
+        self.calls.append(kwargs)
+        index = len(self.calls) - 1
+        meta = {}
+        if index + 1 < len(self.pages):
+            meta["next_token"] = f"token{index + 1}"
+        users = [SimpleNamespace(name=p) for p in self.pages[index]]
+        return self.pages[index], {"users": users}, [], meta
+
+    search_recent_tweets = search
+    search_all_tweets = search
+
+
+def make_twitter_source(client, full_archive=False):
+    source = TwitterSource.__new__(TwitterSource)
+    source._client = client
+    source._full_archive = full_archive
+    return source
+
+
+def test_twitter_pages_with_pagination_token():
+    client = FakeTwitterClient([["a", "b"], ["c"]])
+    source = make_twitter_source(client)
+    now = datetime.now()
+
+    posts = source.get_query_results(
+        "cats", now - timedelta(days=1), now - timedelta(hours=1)
+    )
+
+    assert [post for post, _, _ in posts] == ["a", "b", "c"]
+    assert "pagination_token" not in client.calls[0]
+    assert client.calls[1]["pagination_token"] == "token1"
+    assert "since_id" not in client.calls[1]
+    assert client.calls[0]["end_time"].utcoffset() == timedelta(0)
+
+
+def test_twitter_old_window_requires_full_archive():
+    start = datetime.now() - timedelta(days=30)
+    end = start + timedelta(days=1)
+
+    with pytest.raises(ValueError):
+        make_twitter_source(FakeTwitterClient([[]])).get_query_results(
+            "cats", start, end
+        )
+
+    client = FakeTwitterClient([["a"]])
+    source = make_twitter_source(client, full_archive=True)
+    assert len(source.get_query_results("cats", start, end)) == 1
+    assert client.calls[0]["max_results"] == 500
+
+
+def test_twitter_rejects_end_time_too_close_to_now():
+    source = make_twitter_source(FakeTwitterClient([[]]))
+
+    with pytest.raises(ValueError):
+        source.get_query_results(
+            "cats", datetime.now() - timedelta(hours=1), datetime.now()
+        )